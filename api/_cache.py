@@ -0,0 +1,32 @@
+"""
+api/_cache.py — Short-lived in-process response cache for Vercel serverless functions.
+Warm containers serve repeat GETs without re-querying Supabase. Each api/*.py is its
+own function, so save/unsave can't clear this cache: after a write the dashboard
+sends ?v=<write time>, which keys a fresh entry. Other clients see at most TTL
+seconds of staleness. Not a route itself.
+"""
+import time
+from urllib.parse import urlparse, parse_qs
+
+_CACHE = {}
+MAX_VERSION_LEN = 32   # ?v= is a client timestamp; anything longer is not ours
+
+
+def cache_key(name: str, request_path: str) -> str:
+    """Key for a GET: the endpoint name plus the client's ?v= write marker, if any."""
+    version = parse_qs(urlparse(request_path).query).get("v", [""])[0][:MAX_VERSION_LEN]
+    return f"{name}:{version}"
+
+
+def cached(key: str, ttl: float, fn):
+    """Return fn()'s result, reusing a value computed less than ttl seconds ago."""
+    now = time.monotonic()
+    hit = _CACHE.get(key)
+    if hit and now - hit[0] < ttl:
+        return hit[1]
+    # Each ?v= makes a new key — drop expired entries so the dict stays small
+    for k in [k for k, (t, _) in _CACHE.items() if now - t >= ttl]:
+        del _CACHE[k]
+    value = fn()
+    _CACHE[key] = (now, value)
+    return value
@@ -0,0 +1,37 @@
+"""
+api/_compress.py — Response compression for Vercel serverless functions and server.py.
+Negotiates br/gzip from Accept-Encoding. Not a route itself (underscore prefix).
+"""
+import gzip
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+MIN_COMPRESS_SIZE = 1024   # Below this the encoding overhead isn't worth it
+
+
+def pick_encoding(accept_encoding: str) -> str | None:
+    """Best Content-Encoding we can produce for an Accept-Encoding header."""
+    accepted = {t.split(";")[0].strip().lower() for t in accept_encoding.split(",")}
+    if brotli is not None and "br" in accepted:
+        return "br"
+    if "gzip" in accepted:
+        return "gzip"
+    return None
+
+
+def encode(body: bytes, encoding: str, best: bool = False) -> bytes:
+    """Compress with a pick_encoding() result; best=True trades CPU for size (static assets)."""
+    if encoding == "br":
+        return brotli.compress(body, quality=11 if best else 5)
+    return gzip.compress(body, compresslevel=9 if best else 5)
+
+
+def compress_body(body: bytes, accept_encoding: str) -> tuple:
+    """Return (body, content_encoding); content_encoding is None when left as-is."""
+    encoding = pick_encoding(accept_encoding) if len(body) >= MIN_COMPRESS_SIZE else None
+    if encoding is None:
+        return body, None
+    return encode(body, encoding), encoding
@@ -0,0 +1,15 @@
+"""
+api/_jsonio.py — Shared JSON encode/decode for Vercel serverless functions.
+Thin wrapper over orjson. Not a route itself (underscore prefix).
+"""
+import orjson
+
+_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+
+def dumps(obj) -> bytes:
+    """Serialise to UTF-8 JSON bytes. Unknown types fall back to str()."""
+    return orjson.dumps(obj, option=_OPTIONS, default=str)
+
+
+loads = orjson.loads
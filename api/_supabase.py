@@ -1,15 +1,23 @@
 """
 api/_supabase.py — Shared Supabase client for Vercel serverless functions.
 Imported by all /api/*.py handlers. Not a route itself (underscore prefix).
+The client is built once per container and reused by warm invocations.
 """
 import os
 from supabase import create_client
 
+SUPABASE_URL      = os.environ.get("SUPABASE_URL", "")
+SUPABASE_ANON_KEY = os.environ.get("SUPABASE_ANON_KEY", "")
+
+_CLIENT = None
+
 def get_client():
-    url = os.environ.get("SUPABASE_URL", "")
-    key = os.environ.get("SUPABASE_ANON_KEY", "")
-    if not url or not key:
-        raise RuntimeError("SUPABASE_URL and SUPABASE_ANON_KEY must be set in Vercel env vars")
-    return create_client(url, key)
+    global _CLIENT
+    if _CLIENT is None:
+        if not SUPABASE_URL or not SUPABASE_ANON_KEY:
+            raise RuntimeError("SUPABASE_URL and SUPABASE_ANON_KEY must be set in Vercel env vars")
+        # Anon key only — the client carries no per-user auth state between requests.
+        _CLIENT = create_client(SUPABASE_URL, SUPABASE_ANON_KEY)
+    return _CLIENT
 
 LOOKBACK_HOURS = int(os.environ.get("LOOKBACK_HOURS", "24"))
@@ -3,19 +3,21 @@ api/feed.py — GET /api/feed
 Returns articles from the last 24h directly from Supabase.
 Vercel Serverless Function (Python 3.12)
 """
-import json
 from http.server import BaseHTTPRequestHandler
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone, timedelta
 import sys, os
 sys.path.insert(0, os.path.dirname(__file__))
+from _cache import cache_key, cached
+from _compress import compress_body
+from _jsonio import dumps
 from _supabase import get_client, LOOKBACK_HOURS
 
+CACHE_TTL_SECONDS = 15
+UTC = timezone.utc
 
-def _build_stats(articles: list, client) -> dict:
-    all_saved = client.table("articles").select("id", count="exact").eq("saved", True).execute()
-    all_total = client.table("articles").select("id", count="exact").execute()
-    last_run_r = client.table("scrape_runs").select("run_at").order("run_at", desc=True).limit(1).execute()
 
+def _build_stats(articles: list, all_saved, all_total, last_run_r) -> dict:
     sources = {}
     for a in articles:
         src = a.get("source", "unknown")
@@ -32,23 +34,38 @@ def _build_stats(articles: list, client) -> dict:
     }
 
 
+def _load_feed() -> dict:
+    client = get_client()
+    cutoff = (datetime.now(UTC) - timedelta(hours=LOOKBACK_HOURS)).isoformat()
+
+    # Independent queries → issue them together; counts use head=True so no rows come back
+    queries = {
+        "feed": lambda: (
+            client.table("articles")
+            .select("*")
+            .gte("published_at", cutoff)
+            .order("published_at", desc=True)
+            .execute()
+        ),
+        "saved":    lambda: client.table("articles").select("*", count="exact", head=True).eq("saved", True).execute(),
+        "total":    lambda: client.table("articles").select("*", count="exact", head=True).execute(),
+        "last_run": lambda: client.table("scrape_runs").select("run_at").order("run_at", desc=True).limit(1).execute(),
+    }
+    with ThreadPoolExecutor(max_workers=len(queries)) as ex:
+        futures = {name: ex.submit(q) for name, q in queries.items()}
+        results = {name: f.result() for name, f in futures.items()}
+
+    articles = results["feed"].data or []
+    stats = _build_stats(articles, results["saved"], results["total"], results["last_run"])
+    return {"articles": articles, "stats": stats}
+
+
 class handler(BaseHTTPRequestHandler):
 
     def do_GET(self):
         try:
-            client = get_client()
-            cutoff = (datetime.now(timezone.utc) - timedelta(hours=LOOKBACK_HOURS)).isoformat()
-
-            resp = (
-                client.table("articles")
-                .select("*")
-                .gte("published_at", cutoff)
-                .order("published_at", desc=True)
-                .execute()
-            )
-            articles = resp.data or []
-            stats = _build_stats(articles, client)
-            self._send_json({"articles": articles, "stats": stats})
+            payload = cached(cache_key("feed", self.path), CACHE_TTL_SECONDS, _load_feed)
+            self._send_json(payload)
 
         except Exception as e:
             self._send_json({"error": str(e)}, 500)
@@ -64,10 +81,13 @@ class handler(BaseHTTPRequestHandler):
         self.send_header("Access-Control-Allow-Headers", "Content-Type")
 
     def _send_json(self, data, status=200):
-        body = json.dumps(data, ensure_ascii=False, default=str).encode("utf-8")
+        body, encoding = compress_body(dumps(data), self.headers.get("Accept-Encoding", ""))
         self.send_response(status)
         self.send_header("Content-Type", "application/json")
         self.send_header("Content-Length", str(len(body)))
+        self.send_header("Vary", "Accept-Encoding")
+        if encoding:
+            self.send_header("Content-Encoding", encoding)
         self._cors()
         self.end_headers()
         self.wfile.write(body)
@@ -3,48 +3,57 @@ api/save.py — POST /api/save   |  POST /api/unsave
 Handles save and hard-delete (unsave) in Supabase.
 Vercel Serverless Function (Python 3.12)
 """
-import json
 from http.server import BaseHTTPRequestHandler
-from datetime import datetime, timezone
+from urllib.parse import urlparse
 import sys, os
 sys.path.insert(0, os.path.dirname(__file__))
+from _compress import compress_body
+from _jsonio import dumps, loads
 from _supabase import get_client
 
+MAX_BODY_BYTES = 16 * 1024   # Room for a bulk {"ids": [...]} list; refuse anything bigger
+
 
 class handler(BaseHTTPRequestHandler):
 
     def do_POST(self):
         try:
-            length  = int(self.headers.get("Content-Length", 0))
-            body    = self.rfile.read(length) if length else b""
-            payload = json.loads(body) if body else {}
+            length = int(self.headers.get("Content-Length", 0) or 0)
+        except ValueError:
+            length = 0
+        if length > MAX_BODY_BYTES:
+            self._send_json({"status": "error", "message": "Payload too large"}, 413)
+            return
+        try:
+            body    = self.rfile.read(length) if length > 0 else b""
+            payload = loads(body) if body else {}
         except Exception:
             payload = {}
 
-        article_id = payload.get("id", "").strip()
-        if not article_id:
+        # Accept {"ids": [...]} for bulk actions, or the single-article {"id": "..."}
+        raw_ids = payload.get("ids")
+        if not isinstance(raw_ids, list):
+            raw_ids = [payload.get("id", "")]
+        ids = [i.strip() for i in raw_ids if isinstance(i, str) and i.strip()]
+        if not ids:
             self._send_json({"status": "error", "message": "Missing id"}, 400)
             return
 
         # Detect route: /api/save vs /api/unsave
-        from urllib.parse import urlparse
         path = urlparse(self.path).path
 
         try:
             client = get_client()
 
             if path.endswith("/unsave"):
-                # Hard delete from Supabase
-                client.table("articles").delete().eq("id", article_id).execute()
-                self._send_json({"status": "ok", "action": "deleted"})
+                # Hard delete from Supabase — one request for every id
+                client.table("articles").delete().in_("id", ids).execute()
+                self._send_json({"status": "ok", "action": "deleted", "count": len(ids)})
 
             else:
-                # Mark as saved
-                client.table("articles").update({
-                    "saved":    True,
-                    "saved_at": datetime.now(timezone.utc).isoformat()
-                }).eq("id", article_id).execute()
-                self._send_json({"status": "ok", "action": "saved"})
+                # Mark as saved — one RPC for every id
+                client.rpc("bulk_save", {"p_ids": ids, "p_saved": True}).execute()
+                self._send_json({"status": "ok", "action": "saved", "count": len(ids)})
 
         except Exception as e:
             self._send_json({"status": "error", "message": str(e)}, 500)
@@ -60,10 +69,13 @@ class handler(BaseHTTPRequestHandler):
         self.send_header("Access-Control-Allow-Headers", "Content-Type")
 
     def _send_json(self, data, status=200):
-        body = json.dumps(data, ensure_ascii=False).encode("utf-8")
+        body, encoding = compress_body(dumps(data), self.headers.get("Accept-Encoding", ""))
         self.send_response(status)
         self.send_header("Content-Type", "application/json")
         self.send_header("Content-Length", str(len(body)))
+        self.send_header("Vary", "Accept-Encoding")
+        if encoding:
+            self.send_header("Content-Encoding", encoding)
         self._cors()
         self.end_headers()
         self.wfile.write(body)
@@ -3,49 +3,42 @@ api/saved.py — GET /api/saved
 Returns saved articles from Supabase.
 Vercel Serverless Function (Python 3.12)
 """
-import json
 from http.server import BaseHTTPRequestHandler
-from datetime import datetime, timezone, timedelta
 import sys, os
 sys.path.insert(0, os.path.dirname(__file__))
+from _cache import cache_key, cached
+from _compress import compress_body
+from _jsonio import dumps
 from _supabase import get_client, LOOKBACK_HOURS
 
+CACHE_TTL_SECONDS = 15
 
-class handler(BaseHTTPRequestHandler):
 
-    def do_GET(self):
-        try:
-            client = get_client()
+def _load_saved() -> dict:
+    client = get_client()
 
-            resp = (
-                client.table("articles")
-                .select("*")
-                .eq("saved", True)
-                .order("saved_at", desc=True)
-                .execute()
-            )
-            articles = resp.data or []
+    # One round trip: saved list + stats come back from a single RPC
+    # (see architecture/SOP-003-supabase.md → get_saved_dashboard)
+    resp = client.rpc("get_saved_dashboard", {"p_hours": LOOKBACK_HOURS}).execute()
+    dash = resp.data or {}
+    articles = dash.get("articles") or []
 
-            # Stats
-            all_total  = client.table("articles").select("id", count="exact").execute()
-            cutoff     = (datetime.now(timezone.utc) - timedelta(hours=LOOKBACK_HOURS)).isoformat()
-            today_r    = client.table("articles").select("id", count="exact").gte("published_at", cutoff).execute()
-            last_run_r = client.table("scrape_runs").select("run_at").order("run_at", desc=True).limit(1).execute()
+    stats = {
+        "total_articles": dash.get("total_articles") or 0,
+        "today_count":    dash.get("today_count") or 0,
+        "saved_count":    len(articles),
+        "sources":        dash.get("sources") or {},
+        "last_run":       dash.get("last_run"),
+    }
+    return {"articles": articles, "stats": stats}
 
-            sources = {}
-            for a in articles:
-                src = a.get("source", "unknown")
-                sources[src] = sources.get(src, 0) + 1
 
-            stats = {
-                "total_articles": all_total.count or 0,
-                "today_count":    today_r.count or 0,
-                "saved_count":    len(articles),
-                "sources":        sources,
-                "last_run":       last_run_r.data[0]["run_at"] if last_run_r.data else None,
-            }
+class handler(BaseHTTPRequestHandler):
 
-            self._send_json({"articles": articles, "stats": stats})
+    def do_GET(self):
+        try:
+            payload = cached(cache_key("saved", self.path), CACHE_TTL_SECONDS, _load_saved)
+            self._send_json(payload)
 
         except Exception as e:
             self._send_json({"error": str(e)}, 500)
@@ -61,10 +54,13 @@ class handler(BaseHTTPRequestHandler):
         self.send_header("Access-Control-Allow-Headers", "Content-Type")
 
     def _send_json(self, data, status=200):
-        body = json.dumps(data, ensure_ascii=False, default=str).encode("utf-8")
+        body, encoding = compress_body(dumps(data), self.headers.get("Accept-Encoding", ""))
         self.send_response(status)
         self.send_header("Content-Type", "application/json")
         self.send_header("Content-Length", str(len(body)))
+        self.send_header("Vary", "Accept-Encoding")
+        if encoding:
+            self.send_header("Content-Encoding", encoding)
         self._cors()
         self.end_headers()
         self.wfile.write(body)
@@ -14,6 +14,7 @@ const State = {
     stats: {},
     modalArticleId: null,
     isRefreshing: false,
+    lastWriteAt: 0,       // ms timestamp of the last save/unsave — busts the API response cache
 };
 
 // ─────────────────────────────────────────────────────────────────────────────
@@ -157,7 +158,7 @@ async function loadData() {
     showSkeletons();
     try {
         const endpoint = State.currentTab === 'feed' ? '/api/feed' : '/api/saved';
-        const data = await API.get(endpoint);
+        const data = await API.get(State.lastWriteAt ? `${endpoint}?v=${State.lastWriteAt}` : endpoint);
         State.allArticles = data.articles || [];
         State.stats = data.stats || {};
         updateStats(data.stats);
@@ -342,12 +343,14 @@ async function toggleSave(event, articleId) {
     try {
         if (wasSaved) {
             await API.post('/api/unsave', { id: articleId });
+            State.lastWriteAt = Date.now();
             article.saved = false;
             article.saved_at = null;
             if (btn) { btn.classList.remove('saved'); btn.title = 'Save article'; }
             showToast('Removed from saved', 'info');
         } else {
             await API.post('/api/save', { id: articleId });
+            State.lastWriteAt = Date.now();
             article.saved = true;
             article.saved_at = new Date().toISOString();
             if (btn) { btn.classList.add('saved'); btn.title = 'Remove from saved'; }
@@ -4,21 +4,28 @@ Web server that serves the dashboard and provides the REST API.
 Default port: 3737 (configurable via DASHBOARD_PORT in .env)
 """
 
-import json
+import shutil
 import sys
+import threading
 import logging
 import os
 from pathlib import Path
-from http.server import HTTPServer, BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
 from urllib.parse import urlparse
 
 # Add tools to the path
 sys.path.insert(0, str(Path(__file__).parent / "tools"))
 from store import (
-    load_store, save_article, unsave_article,
+    load_store, compact_store, save_article, unsave_article,
     get_today_feed, get_saved_articles, get_stats, merge_and_store
 )
 from scraper import run_all_scrapers
+from _jsonio import dumps, loads
+
+# Compression is shared with the Vercel handlers. Appended, not inserted, so
+# tools/_jsonio above keeps precedence over api/_jsonio.
+sys.path.append(str(Path(__file__).parent / "api"))
+from _compress import pick_encoding, encode, compress_body
 
 from dotenv import load_dotenv
 load_dotenv()
@@ -33,6 +40,15 @@ logging.basicConfig(
 )
 log = logging.getLogger("server")
 
+# Requests are served on separate threads; only one scrape may run at once.
+# (store.py serialises its own writes.)
+_REFRESH_LOCK = threading.Lock()
+
+MAX_BODY_BYTES = 4096      # POST bodies are tiny {"id": "..."} payloads
+
+# Compressed static assets: (path, encoding) → (mtime_ns, blob)
+_ASSET_CACHE: dict = {}
+
 
 class DashboardHandler(BaseHTTPRequestHandler):
 
@@ -40,10 +56,13 @@ class DashboardHandler(BaseHTTPRequestHandler):
         log.info(f"{self.address_string()} — {format % args}")
 
     def send_json(self, data: dict, status: int = 200):
-        body = json.dumps(data, ensure_ascii=False).encode("utf-8")
+        body, encoding = compress_body(dumps(data), self.headers.get("Accept-Encoding", ""))
         self.send_response(status)
         self.send_header("Content-Type", "application/json")
         self.send_header("Content-Length", str(len(body)))
+        self.send_header("Vary", "Accept-Encoding")
+        if encoding:
+            self.send_header("Content-Encoding", encoding)
         self.send_header("Access-Control-Allow-Origin", "*")
         self.end_headers()
         self.wfile.write(body)
@@ -53,12 +72,42 @@ class DashboardHandler(BaseHTTPRequestHandler):
             self.send_response(404)
             self.end_headers()
             return
-        body = path.read_bytes()
+        st = path.stat()
+        blob, encoding = self._compressed_asset(path, st.st_mtime_ns)
+        etag = f'"{st.st_mtime_ns:x}-{st.st_size:x}{"-" + encoding if encoding else ""}"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
         self.send_response(200)
         self.send_header("Content-Type", content_type)
-        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Content-Length", str(len(blob) if encoding else st.st_size))
+        self.send_header("ETag", etag)
+        self.send_header("Vary", "Accept-Encoding")
+        if encoding:
+            self.send_header("Content-Encoding", encoding)
         self.end_headers()
-        self.wfile.write(body)
+        if encoding:
+            self.wfile.write(blob)
+            return
+        # Stream in 64 KB chunks rather than reading the whole file into memory
+        with path.open("rb") as f:
+            shutil.copyfileobj(f, self.wfile, length=65536)
+
+    def _compressed_asset(self, path: Path, mtime_ns: int) -> tuple:
+        """Compressed bytes of a static file for this client, cached until the file changes."""
+        encoding = pick_encoding(self.headers.get("Accept-Encoding", ""))
+        if encoding is None:
+            return None, None
+
+        key = (str(path), encoding)
+        hit = _ASSET_CACHE.get(key)
+        if hit and hit[0] == mtime_ns:
+            return hit[1], encoding
+        blob = encode(path.read_bytes(), encoding, best=True)
+        _ASSET_CACHE[key] = (mtime_ns, blob)
+        return blob, encoding
 
     def do_GET(self):
         parsed = urlparse(self.path)
@@ -110,6 +159,9 @@ class DashboardHandler(BaseHTTPRequestHandler):
         if path == "/api/refresh":
             # Trigger a fresh scrape + store merge
             log.info("[API] Manual refresh triggered")
+            if not _REFRESH_LOCK.acquire(blocking=False):
+                self.send_json({"status": "busy", "message": "Refresh already running"}, 409)
+                return
             try:
                 scrape_summary = run_all_scrapers()
                 store_summary = merge_and_store()
@@ -121,6 +173,8 @@ class DashboardHandler(BaseHTTPRequestHandler):
             except Exception as e:
                 log.error(f"[API] Refresh failed: {e}")
                 self.send_json({"status": "error", "message": str(e)}, 500)
+            finally:
+                _REFRESH_LOCK.release()
             return
 
         self.send_response(404)
@@ -130,11 +184,17 @@ class DashboardHandler(BaseHTTPRequestHandler):
         parsed = urlparse(self.path)
         path = parsed.path
 
-        # Read body
-        length = int(self.headers.get("Content-Length", 0))
-        body = self.rfile.read(length) if length else b""
+        # Read body (small JSON payloads only — refuse oversized requests unread)
+        try:
+            length = int(self.headers.get("Content-Length", 0) or 0)
+        except ValueError:
+            length = 0
+        if length > MAX_BODY_BYTES:
+            self.send_json({"status": "error", "message": "Payload too large"}, 413)
+            return
+        body = self.rfile.read(length) if length > 0 else b""
         try:
-            payload = json.loads(body) if body else {}
+            payload = loads(body) if body else {}
         except Exception:
             payload = {}
 
@@ -182,8 +242,11 @@ def main():
             merge_and_store()
         except Exception as e:
             log.error(f"[Server] Initial scrape failed: {e}")
+    else:
+        # This process owns the store from here on — fold in ops left by the last run
+        compact_store()
 
-    server = HTTPServer(("localhost", PORT), DashboardHandler)
+    server = ThreadingHTTPServer(("localhost", PORT), DashboardHandler)
     try:
         log.info(f"✅ Dashboard live at http://localhost:{PORT}")
         # Open browser
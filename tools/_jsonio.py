@@ -0,0 +1,65 @@
+"""
+_jsonio.py — AI Pulse Dashboard
+Shared JSON encode/decode for the local tools and server.
+Uses orjson when installed, otherwise falls back to the stdlib json module.
+"""
+
+import json
+import mmap
+import os
+from pathlib import Path
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# orjson.JSONDecodeError subclasses this, so one except clause covers both backends
+JSONDecodeError = json.JSONDecodeError
+
+# Files at least this big are mmapped into orjson rather than copied into a bytes object
+MMAP_THRESHOLD = 8 * 1024 * 1024
+
+if orjson is not None:
+    _OPTIONS = orjson.OPT_NON_STR_KEYS
+
+    def dumps(obj, indent: bool = False) -> bytes:
+        """Serialise to UTF-8 JSON bytes. Unknown types fall back to str()."""
+        option = (_OPTIONS | orjson.OPT_INDENT_2) if indent else _OPTIONS
+        return orjson.dumps(obj, option=option, default=str)
+
+    loads = orjson.loads
+
+else:
+    def dumps(obj, indent: bool = False) -> bytes:
+        """Serialise to UTF-8 JSON bytes. Unknown types fall back to str()."""
+        if indent:
+            return json.dumps(obj, ensure_ascii=False, indent=2, default=str).encode("utf-8")
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":"),
+                          default=str).encode("utf-8")
+
+    loads = json.loads
+
+
+def load_file(path: Path):
+    """Parse a JSON file, reading it in one go (mmapped when large and orjson is available)."""
+    if orjson is not None and path.stat().st_size >= MMAP_THRESHOLD:
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+            with memoryview(m) as view:
+                return orjson.loads(view)
+    return loads(path.read_bytes())
+
+
+def dump_file(path: Path, obj, indent: bool = False, fsync: bool = False) -> None:
+    """
+    Write obj as JSON via a sibling temp file + os.replace, so readers never see a torn file.
+    fsync=True flushes the temp file to disk before the swap (for primary data).
+    """
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    payload = dumps(obj, indent=indent)
+    with open(tmp, "wb") as f:
+        f.write(payload)
+        if fsync:
+            f.flush()
+            os.fsync(f.fileno())
+    os.replace(tmp, path)
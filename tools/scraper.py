@@ -6,17 +6,29 @@ Schema Reference: gemini.md Section 2.1
 """
 
 import os
-import json
+import re
+import html
+import asyncio
 import hashlib
 import time
 import logging
+import aiohttp
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
 from bs4 import BeautifulSoup
+from dateutil import parser as dateutil_parser
+from selectolax.lexbor import LexborHTMLParser
 from dotenv import load_dotenv
 import feedparser
 
+from _jsonio import loads, dump_file
+from store import load_seen
+
 # ─────────────────────────────────────────────────────────────────────────────
 # Setup
 # ─────────────────────────────────────────────────────────────────────────────
@@ -37,58 +49,96 @@ logging.basicConfig(
 )
 log = logging.getLogger("scraper")
 
+UTC = timezone.utc
 LOOKBACK_HOURS = int(os.getenv("LOOKBACK_HOURS", "24"))
 HEADERS = {
     "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
                   "(KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36"
 }
+ARTICLE_FETCH_WORKERS = 5   # Concurrent article-page fetches per source
+RUNDOWN_MAX_ARTICLES = 10   # Stop fetching Rundown pages once this many are in the window
+REDDIT_CONCURRENCY = 2      # Max in-flight subreddit requests (politeness)
+RUNDOWN_CACHE_FILE = TMP_DIR / "therundown_cache.json"   # ETag / meta cache per article URL
+
+# Shared session — keeps TLS connections to each host alive across requests
+_SESSION = requests.Session()
+_SESSION.headers.update(HEADERS)
+_adapter = HTTPAdapter(
+    pool_connections=8,
+    pool_maxsize=32,
+    max_retries=Retry(total=2, backoff_factor=0.3,
+                      status_forcelist=[429, 500, 502, 503, 504])
+)
+_SESSION.mount("https://", _adapter)
+_SESSION.mount("http://", _adapter)
+
+_TAG_RE = re.compile(r"<[^>]+>")
+_SPACE_RE = re.compile(r"\s+")
+_META_RE = re.compile(
+    rb'<meta\s+(?:property|name)="(article:published_time|publish_date|og:article:published_time'
+    rb'|og:description|description|og:image)"\s+content="([^"]*)"',
+    re.I
+)
 
 
 # ─────────────────────────────────────────────────────────────────────────────
 # Helpers
 # ─────────────────────────────────────────────────────────────────────────────
+@lru_cache(maxsize=8192)
 def make_id(url: str) -> str:
-    """SHA256 hash of the URL — unique, stable article identifier."""
+    """SHA256 hash of the URL — unique, stable article identifier (memoised per URL)."""
     return hashlib.sha256(url.encode("utf-8")).hexdigest()
 
 
 def is_within_window(dt: datetime) -> bool:
     """True if the datetime is within the lookback window."""
     if dt.tzinfo is None:
-        dt = dt.replace(tzinfo=timezone.utc)
-    cutoff = datetime.now(timezone.utc) - timedelta(hours=LOOKBACK_HOURS)
+        dt = dt.replace(tzinfo=UTC)
+    cutoff = datetime.now(UTC) - timedelta(hours=LOOKBACK_HOURS)
     return dt >= cutoff
 
 
 def save_raw(filename: str, articles: list) -> None:
-    """Save raw articles to .tmp/"""
+    """Save raw articles to .tmp/ (atomically — the merger never sees a half-written file)."""
     path = TMP_DIR / filename
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(articles, f, indent=2, ensure_ascii=False)
+    dump_file(path, articles, indent=True)
     log.info(f"Saved {len(articles)} articles → {path}")
 
 
-def get_page(url: str) -> BeautifulSoup | None:
-    """GET a URL and return BeautifulSoup, or None on failure."""
+def fetch_html(url: str) -> str | None:
+    """GET a URL and return the response text, or None on failure."""
     try:
-        resp = requests.get(url, headers=HEADERS, timeout=15)
+        resp = _SESSION.get(url, timeout=15)
         resp.raise_for_status()
-        return BeautifulSoup(resp.text, "html.parser")
+        return resp.text
     except Exception as e:
         log.error(f"Failed to fetch {url}: {e}")
         return None
 
 
+def get_page(url: str) -> BeautifulSoup | None:
+    """GET a URL and return BeautifulSoup (lxml parser), or None on failure."""
+    text = fetch_html(url)
+    return BeautifulSoup(text, "lxml") if text is not None else None
+
+
+def strip_html(fragment: str) -> str:
+    """Drop tags and collapse whitespace — cheaper than a full parse for short snippets."""
+    text = html.unescape(_TAG_RE.sub(" ", fragment))
+    return _SPACE_RE.sub(" ", text).strip()
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # Source 1: Ben's Bites
 # ─────────────────────────────────────────────────────────────────────────────
-def scrape_bensbites() -> list:
+def scrape_bensbites(now_iso: str | None = None) -> list:
     """
     Strategy: Try multiple feed endpoints for Ben's Bites.
     1. Try Substack RSS (they moved to substack)
     2. Try Beehiiv web scraping
     3. Try common beehiiv RSS patterns
     """
+    now_iso = now_iso or datetime.now(UTC).isoformat()
     articles = []
 
     # Strategy 1: Substack RSS
@@ -110,9 +160,9 @@ def scrape_bensbites() -> list:
                         # Parse pub date
                         pub_struct = entry.get("published_parsed") or entry.get("updated_parsed")
                         if pub_struct:
-                            pub_dt = datetime(*pub_struct[:6], tzinfo=timezone.utc)
+                            pub_dt = datetime(*pub_struct[:6], tzinfo=UTC)
                         else:
-                            pub_dt = datetime.now(timezone.utc)
+                            pub_dt = datetime.now(UTC)
 
                         if not is_within_window(pub_dt):
                             continue
@@ -124,8 +174,7 @@ def scrape_bensbites() -> list:
                         summary = entry.get("summary", "")
                         # Strip HTML from summary
                         if summary:
-                            soup = BeautifulSoup(summary, "html.parser")
-                            summary = soup.get_text(separator=" ", strip=True)[:500]
+                            summary = strip_html(summary)[:500]
 
                         articles.append({
                             "id": make_id(url),
@@ -134,7 +183,7 @@ def scrape_bensbites() -> list:
                             "summary": summary,
                             "url": url,
                             "published_at": pub_dt.isoformat(),
-                            "scraped_at": datetime.now(timezone.utc).isoformat(),
+                            "scraped_at": now_iso,
                             "author": entry.get("author", "Ben Tossell"),
                             "tags": ["AI", "Newsletter"],
                             "image_url": None
@@ -154,6 +203,8 @@ def scrape_bensbites() -> list:
     log.info("[BensBites] Falling back to HTML scraping...")
     archive_url = "https://bensbites.beehiiv.com/archive"
     soup = get_page(archive_url)
+    known = load_seen("bensbites")
+    picked = 0
     if soup:
         # Try to find article links
         links = soup.find_all("a", href=True)
@@ -167,6 +218,12 @@ def scrape_bensbites() -> list:
                 title = link.get_text(strip=True)
                 if len(title) < 10:
                     continue
+                picked += 1
+                if picked > 5:  # Limit to top 5 from HTML scrape
+                    break
+                # Already merged into the store on an earlier run
+                if full_url in known:
+                    continue
                 # Can't reliably get date from list page — include and flag
                 articles.append({
                     "id": make_id(full_url),
@@ -174,17 +231,17 @@ def scrape_bensbites() -> list:
                     "title": title,
                     "summary": "Visit article for full content.",
                     "url": full_url,
-                    "published_at": datetime.now(timezone.utc).isoformat(),
-                    "scraped_at": datetime.now(timezone.utc).isoformat(),
+                    "published_at": now_iso,
+                    "scraped_at": now_iso,
                     "author": "Ben Tossell",
                     "tags": ["AI", "Newsletter"],
                     "image_url": None
                 })
-                if len(articles) >= 5:  # Limit to top 5 from HTML scrape
-                    break
 
     if articles:
         log.info(f"[BensBites] ✅ Scraped {len(articles)} articles from HTML")
+    elif picked:
+        log.info("[BensBites] No new articles in HTML archive since last run")
     else:
         log.warning("[BensBites] ⚠️ No articles found — source may require auth or has changed")
 
@@ -195,11 +252,112 @@ def scrape_bensbites() -> list:
 # ─────────────────────────────────────────────────────────────────────────────
 # Source 2: The AI Rundown
 # ─────────────────────────────────────────────────────────────────────────────
-def scrape_therundown() -> list:
+def load_rundown_cache() -> dict:
+    """Load the per-URL conditional-GET cache, or an empty one if missing/corrupt."""
+    try:
+        return loads(RUNDOWN_CACHE_FILE.read_bytes())
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        log.warning(f"[TheRundown] Ignoring unreadable cache {RUNDOWN_CACHE_FILE}: {e}")
+        return {}
+
+
+def parse_therundown_meta(raw: bytes) -> dict:
+    """
+    Pull published time, description and image out of an article page's meta tags.
+    A single regex pass over the raw bytes covers the usual markup; the page is
+    only parsed into a tree for fields the regex missed (e.g. reordered attributes).
+    """
+    found = {}
+    for m in _META_RE.finditer(raw):
+        found.setdefault(m.group(1).decode().lower(),
+                         html.unescape(m.group(2).decode("utf-8", "replace")))
+
+    meta = {
+        "published_at": (found.get("article:published_time") or found.get("publish_date") or
+                         found.get("og:article:published_time")),
+        "summary": found.get("og:description") or found.get("description"),
+        "image_url": found.get("og:image"),
+    }
+    if all(meta.values()):
+        return meta
+
+    tree = LexborHTMLParser(raw)
+
+    def meta_content(*selectors: str) -> str | None:
+        for sel in selectors:
+            node = tree.css_first(sel)
+            if node and node.attributes.get("content"):
+                return node.attributes["content"]
+        return None
+
+    return {
+        # Try og:article:published_time
+        "published_at": meta["published_at"] or meta_content(
+            'meta[property="article:published_time"]',
+            'meta[name="publish_date"]',
+            'meta[property="og:article:published_time"]',
+        ),
+        # Try og:description for summary
+        "summary": meta["summary"] or meta_content(
+            'meta[property="og:description"]', 'meta[name="description"]'),
+        # Try og:image
+        "image_url": meta["image_url"] or meta_content('meta[property="og:image"]'),
+    }
+
+
+def fetch_therundown_meta(url: str, cache: dict | None = None) -> tuple:
+    """
+    Fetch a Rundown article page and read its meta tags.
+    With a cache, sends If-None-Match / If-Modified-Since and reuses the
+    stored meta on 304 Not Modified; fresh 200 responses overwrite the entry.
+    Returns (published_at, summary, image_url); published_at falls back to now.
+    """
+    cached = cache.get(url) if cache is not None else None
+    headers = {}
+    if cached:
+        if cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        if cached.get("last_modified"):
+            headers["If-Modified-Since"] = cached["last_modified"]
+
+    meta = {}
+    try:
+        resp = _SESSION.get(url, headers=headers, timeout=15)
+        if resp.status_code == 304 and cached:
+            meta = cached.get("meta", {})
+        else:
+            resp.raise_for_status()
+            meta = parse_therundown_meta(resp.content)
+            if cache is not None:
+                cache[url] = {
+                    "etag": resp.headers.get("ETag"),
+                    "last_modified": resp.headers.get("Last-Modified"),
+                    "meta": meta,
+                }
+    except Exception as e:
+        log.error(f"Failed to fetch {url}: {e}")
+
+    pub_dt = datetime.now(UTC)
+    if meta.get("published_at"):
+        try:
+            pub_dt = dateutil_parser.parse(meta["published_at"])
+            if pub_dt.tzinfo is None:
+                pub_dt = pub_dt.replace(tzinfo=UTC)
+        except Exception:
+            pass
+
+    summary = (meta.get("summary") or "")[:500]
+    return pub_dt, summary, meta.get("image_url")
+
+
+def scrape_therundown(now_iso: str | None = None) -> list:
     """
     Scrapes The AI Rundown homepage for latest article cards.
     Each article links to /p/<slug>.
     """
+    now_iso = now_iso or datetime.now(UTC).isoformat()
     articles = []
     base_url = "https://www.therundown.ai"
 
@@ -210,13 +368,15 @@ def scrape_therundown() -> list:
         return []
 
     seen = set()
+    known = load_seen("therundown")
+    candidates = []
 
     # Find all links pointing to /p/ slugs
     for a_tag in soup.find_all("a", href=True):
         href = a_tag.get("href", "")
         if href.startswith("/p/") or "/p/" in href:
             full_url = href if href.startswith("http") else f"{base_url}{href}"
-            if full_url in seen:
+            if full_url in seen or full_url in known:
                 continue
             seen.add(full_url)
 
@@ -231,62 +391,49 @@ def scrape_therundown() -> list:
             if len(title) < 8:
                 continue
 
-            # Try to get published date from the slug (e.g. URL won't have date, need meta)
-            # We'll fetch the article page to get og:published_time
-            time.sleep(0.5)
-            article_soup = get_page(full_url)
-            pub_dt = datetime.now(timezone.utc)
-            summary = ""
-            image_url = None
-
-            if article_soup:
-                # Try og:article:published_time
-                meta_pub = (
-                    article_soup.find("meta", property="article:published_time") or
-                    article_soup.find("meta", attrs={"name": "publish_date"}) or
-                    article_soup.find("meta", property="og:article:published_time")
-                )
-                if meta_pub and meta_pub.get("content"):
-                    try:
-                        from dateutil import parser as dateutil_parser
-                        pub_dt = dateutil_parser.parse(meta_pub["content"])
-                        if pub_dt.tzinfo is None:
-                            pub_dt = pub_dt.replace(tzinfo=timezone.utc)
-                    except Exception:
-                        pass
-
-                # Try og:description for summary
-                meta_desc = (
-                    article_soup.find("meta", property="og:description") or
-                    article_soup.find("meta", attrs={"name": "description"})
-                )
-                if meta_desc and meta_desc.get("content"):
-                    summary = meta_desc["content"][:500]
-
-                # Try og:image
-                meta_img = article_soup.find("meta", property="og:image")
-                if meta_img and meta_img.get("content"):
-                    image_url = meta_img["content"]
-
-            if not is_within_window(pub_dt):
-                log.info(f"[TheRundown] Skipping old article: {title[:50]}")
-                continue
+            candidates.append((full_url, title))
 
-            articles.append({
-                "id": make_id(full_url),
-                "source": "therundown",
-                "title": title,
-                "summary": summary or "Daily AI briefing from The Rundown AI.",
-                "url": full_url,
-                "published_at": pub_dt.isoformat(),
-                "scraped_at": datetime.now(timezone.utc).isoformat(),
-                "author": "Zach Mink",
-                "tags": ["AI", "Newsletter", "Daily Briefing"],
-                "image_url": image_url
-            })
-
-            if len(articles) >= 10:
+    # The listing has no dates — fetch each article page for its meta tags.
+    # Pages are fetched one pool-sized window at a time, in homepage order, so
+    # stopping at RUNDOWN_MAX_ARTICLES leaves at most one window of extra requests.
+    cache = load_rundown_cache()
+    with ThreadPoolExecutor(max_workers=ARTICLE_FETCH_WORKERS) as ex:
+        for i in range(0, len(candidates), ARTICLE_FETCH_WORKERS):
+            if len(articles) >= RUNDOWN_MAX_ARTICLES:
                 break
+            window = candidates[i:i + ARTICLE_FETCH_WORKERS]
+            metas = ex.map(lambda url: fetch_therundown_meta(url, cache),
+                           [url for url, _ in window])
+
+            for (full_url, title), (pub_dt, summary, image_url) in zip(window, metas):
+                if not is_within_window(pub_dt):
+                    log.info(f"[TheRundown] Skipping old article: {title[:50]}")
+                    continue
+
+                articles.append({
+                    "id": make_id(full_url),
+                    "source": "therundown",
+                    "title": title,
+                    "summary": summary or "Daily AI briefing from The Rundown AI.",
+                    "url": full_url,
+                    "published_at": pub_dt.isoformat(),
+                    "scraped_at": now_iso,
+                    "author": "Zach Mink",
+                    "tags": ["AI", "Newsletter", "Daily Briefing"],
+                    "image_url": image_url
+                })
+
+                if len(articles) >= RUNDOWN_MAX_ARTICLES:
+                    break
+
+    # Keep only this run's candidates — anything else has left the homepage or
+    # is already in the seen-set, so it will never be fetched again
+    live = {url for url, _ in candidates}
+    cache = {url: entry for url, entry in cache.items() if url in live}
+    try:
+        dump_file(RUNDOWN_CACHE_FILE, cache)
+    except Exception as e:
+        log.warning(f"[TheRundown] Could not persist cache: {e}")
 
     log.info(f"[TheRundown] ✅ Found {len(articles)} articles in last {LOOKBACK_HOURS}h")
     save_raw("raw_therundown.json", articles)
@@ -296,12 +443,38 @@ def scrape_therundown() -> list:
 # ─────────────────────────────────────────────────────────────────────────────
 # Source 3: Reddit
 # ─────────────────────────────────────────────────────────────────────────────
-def scrape_reddit() -> list:
+async def fetch_subreddits_json(subreddits: list, user_agent: str) -> list:
+    """
+    Fetch /r/<sub>/new.json for every subreddit over one keep-alive session.
+    Returns one entry per subreddit, in order: the decoded JSON, or the exception.
+    """
+    sem = asyncio.Semaphore(REDDIT_CONCURRENCY)  # Be polite to Reddit
+
+    async def fetch_sub(session: aiohttp.ClientSession, sub_name: str) -> dict:
+        url = f"https://www.reddit.com/r/{sub_name}/new.json?limit=25"
+        async with sem, session.get(url) as resp:
+            resp.raise_for_status()
+            return loads(await resp.read())
+
+    connector = aiohttp.TCPConnector(limit=10, ttl_dns_cache=300)
+    async with aiohttp.ClientSession(
+        connector=connector,
+        headers={"User-Agent": user_agent},
+        timeout=aiohttp.ClientTimeout(total=15),
+    ) as session:
+        return await asyncio.gather(
+            *(fetch_sub(session, sub) for sub in subreddits),
+            return_exceptions=True
+        )
+
+
+def scrape_reddit(now_iso: str | None = None) -> list:
     """
     Uses PRAW to scrape top new posts from AI subreddits.
     Requires REDDIT_CLIENT_ID, REDDIT_CLIENT_SECRET, REDDIT_USER_AGENT in .env
     Falls back to Reddit JSON API if PRAW credentials not set.
     """
+    now_iso = now_iso or datetime.now(UTC).isoformat()
     articles = []
     subreddits = ["artificial", "MachineLearning", "ArtificialIntelligence"]
 
@@ -324,7 +497,7 @@ def scrape_reddit() -> list:
                 try:
                     sub = reddit.subreddit(sub_name)
                     for post in sub.new(limit=25):
-                        created_dt = datetime.fromtimestamp(post.created_utc, tz=timezone.utc)
+                        created_dt = datetime.fromtimestamp(post.created_utc, tz=UTC)
                         if not is_within_window(created_dt):
                             continue
                         if post.score < 5:
@@ -341,7 +514,7 @@ def scrape_reddit() -> list:
                             "summary": summary,
                             "url": url,
                             "published_at": created_dt.isoformat(),
-                            "scraped_at": datetime.now(timezone.utc).isoformat(),
+                            "scraped_at": now_iso,
                             "author": str(post.author) if post.author else "Unknown",
                             "tags": ["Reddit", f"r/{sub_name}", "AI"],
                             "image_url": (post.thumbnail if post.thumbnail and
@@ -362,20 +535,18 @@ def scrape_reddit() -> list:
 
     # Strategy 2: Reddit public JSON API (no auth needed)
     log.info("[Reddit] Using public JSON API (limited to top 25 new posts)")
-    for sub_name in subreddits:
-        url = f"https://www.reddit.com/r/{sub_name}/new.json?limit=25"
+    results = asyncio.run(fetch_subreddits_json(subreddits, user_agent))
+    for sub_name, data in zip(subreddits, results):
+        if isinstance(data, Exception):
+            log.error(f"[Reddit] JSON API failed for r/{sub_name}: {data}")
+            continue
         try:
-            resp = requests.get(url, headers={
-                "User-Agent": user_agent
-            }, timeout=15)
-            resp.raise_for_status()
-            data = resp.json()
             posts = data.get("data", {}).get("children", [])
 
             for item in posts:
                 post = item.get("data", {})
                 created_utc = post.get("created_utc", 0)
-                created_dt = datetime.fromtimestamp(created_utc, tz=timezone.utc)
+                created_dt = datetime.fromtimestamp(created_utc, tz=UTC)
 
                 if not is_within_window(created_dt):
                     continue
@@ -398,15 +569,13 @@ def scrape_reddit() -> list:
                     "summary": summary,
                     "url": full_url,
                     "published_at": created_dt.isoformat(),
-                    "scraped_at": datetime.now(timezone.utc).isoformat(),
+                    "scraped_at": now_iso,
                     "author": post.get("author", "Unknown"),
                     "tags": ["Reddit", f"r/{sub_name}", "AI"],
                     "image_url": image_url
                 })
-
-            time.sleep(1)  # Be polite to Reddit
         except Exception as e:
-            log.error(f"[Reddit] JSON API failed for r/{sub_name}: {e}")
+            log.error(f"[Reddit] Failed to parse r/{sub_name}: {e}")
 
     log.info(f"[Reddit] ✅ Found {len(articles)} posts via JSON API")
     save_raw("raw_reddit.json", articles)
@@ -422,14 +591,32 @@ def run_all_scrapers() -> dict:
     log.info(f"AI Pulse Scraper — Starting (lookback: {LOOKBACK_HOURS}h)")
     log.info("=" * 60)
 
-    start = datetime.now(timezone.utc)
+    start = datetime.now(UTC)
+    now_iso = start.isoformat()   # One batch timestamp for every article's scraped_at
 
-    bb_articles = scrape_bensbites()
-    tr_articles = scrape_therundown()
-    rd_articles = scrape_reddit()
+    # Sources are independent and network-bound — run them side by side
+    scrapers = {
+        "bensbites": scrape_bensbites,
+        "therundown": scrape_therundown,
+        "reddit": scrape_reddit,
+    }
+    results = {}
+    with ThreadPoolExecutor(max_workers=len(scrapers)) as ex:
+        futures = {ex.submit(fn, now_iso): name for name, fn in scrapers.items()}
+        for fut in as_completed(futures):
+            name = futures[fut]
+            try:
+                results[name] = fut.result()
+            except Exception as e:
+                log.error(f"[{name}] Scraper failed: {e}")
+                results[name] = []
+
+    bb_articles = results["bensbites"]
+    tr_articles = results["therundown"]
+    rd_articles = results["reddit"]
 
     total = len(bb_articles) + len(tr_articles) + len(rd_articles)
-    elapsed = (datetime.now(timezone.utc) - start).total_seconds()
+    elapsed = (datetime.now(UTC) - start).total_seconds()
 
     summary = {
         "run_at": start.isoformat(),
@@ -6,15 +6,22 @@ SOP Reference: architecture/SOP-002-store.md
 Schema Reference: gemini.md Section 2.2
 """
 
-import json
 import logging
+import queue
 import shutil
 import threading
+import time
+from bisect import bisect_left, insort
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from operator import itemgetter
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
 import os
 from dotenv import load_dotenv
 
+from _jsonio import dumps, loads, load_file, dump_file, JSONDecodeError
+
 load_dotenv()
 
 BASE_DIR = Path(__file__).parent.parent
@@ -24,8 +31,22 @@ DATA_DIR.mkdir(exist_ok=True)
 
 STORE_FILE = DATA_DIR / "articles_store.json"
 BACKUP_FILE = DATA_DIR / "articles_store.backup.json"
-
+# (source name, raw file in TMP_DIR) merged on each run
+_RAW_SOURCES = (
+    ("bensbites", "raw_bensbites.json"),
+    ("therundown", "raw_therundown.json"),
+    ("reddit", "raw_reddit.json"),
+)
+# Append-only log of save/unsave ops not yet folded into STORE_FILE
+OPS_FILE = DATA_DIR / "articles_ops.jsonl"
+COMPACT_EVERY_OPS = 200
+
+SEEN_RETENTION_HOURS = 7 * 24   # How long a merged URL is skipped by the scraper
+_SEEN_SOURCES = ("bensbites", "therundown")   # Scrapers that consult load_seen()
 LOOKBACK_HOURS = int(os.getenv("LOOKBACK_HOURS", "24"))
+UTC = timezone.utc
+# The store is machine-read, so it is written compact; PRETTY_STORE=1 indents it for inspection
+PRETTY_STORE = os.getenv("PRETTY_STORE", "0") == "1"
 
 log = logging.getLogger("store")
 
@@ -33,30 +54,206 @@ log = logging.getLogger("store")
 # ─────────────────────────────────────────────────────────────────────────────
 # Store I/O
 # ─────────────────────────────────────────────────────────────────────────────
-def load_store() -> dict:
-    """Load the persistent article store. Creates empty store if missing."""
-    if not STORE_FILE.exists():
-        log.info("[Store] No existing store — creating fresh.")
-        return {"articles": [], "last_run": None, "run_count": 0}
+# Parsed store kept in memory between calls; reloaded only when the file's
+# mtime changes. "index" maps article id → the same dict held in "articles";
+# "saved" is a sorted list of (-saved_at ts, id), newest saved first;
+# "ops" counts lines in OPS_FILE since the last snapshot.
+_STORE_LOCK = threading.RLock()
+_STORE_CACHE = {"mtime": None, "data": None, "index": {}, "saved": [], "ops": 0}
 
+
+def _iso_ts(value) -> float:
+    """Unix seconds for an ISO datetime string (naive = UTC); 0 if missing or unparseable."""
     try:
-        with open(STORE_FILE, "r", encoding="utf-8") as f:
-            data = json.load(f)
-        log.info(f"[Store] Loaded {len(data.get('articles', []))} existing articles")
+        dt = datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return 0
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=UTC)
+    return dt.timestamp()
+
+
+def _saved_key(article: dict) -> tuple:
+    return (-_iso_ts(article.get("saved_at")), article["id"])
+
+
+def _rebuild_saved() -> None:
+    _STORE_CACHE["saved"] = sorted(
+        _saved_key(a) for a in _STORE_CACHE["index"].values() if a.get("saved")
+    )
+
+
+def _drop_saved(article: dict) -> None:
+    """Remove the article's entry from the saved list, if it has one."""
+    saved = _STORE_CACHE["saved"]
+    key = _saved_key(article)
+    i = bisect_left(saved, key)
+    if i < len(saved) and saved[i] == key:
+        del saved[i]
+
+
+def _set_cache(store: dict, mtime) -> None:
+    _STORE_CACHE["data"] = store
+    _STORE_CACHE["mtime"] = mtime
+    index = {}
+    for a in store.get("articles", []):
+        if "published_ts" not in a:
+            # Stores written before published_ts existed (or pulled from Supabase)
+            a["published_ts"] = int(_iso_ts(a.get("published_at")))
+        if a.get("id"):
+            index[a["id"]] = a
+    _STORE_CACHE["index"] = index
+    _STORE_CACHE["ops"] = 0
+    _rebuild_saved()
+
+
+def _replay_ops(store: dict) -> int:
+    """Apply OPS_FILE on top of a freshly loaded snapshot. Returns ops applied."""
+    if not OPS_FILE.exists():
+        return 0
+    index = _STORE_CACHE["index"]
+    deleted = set()
+    applied = 0
+    for line in OPS_FILE.read_bytes().splitlines():
+        try:
+            op = loads(line)
+        except JSONDecodeError:
+            # Torn last line from a crash mid-append — everything before it is intact
+            log.warning("[Store] Skipping unreadable line in ops log")
+            continue
+        if op.get("op") == "delete":
+            if index.pop(op["id"], None) is not None:
+                deleted.add(op["id"])
+        elif op.get("op") == "upsert":
+            article = index.get(op["id"])
+            if article is not None:
+                article.update(op.get("fields", {}))
+        applied += 1
+    if deleted:
+        store["articles"] = [a for a in store["articles"] if a.get("id") not in deleted]
+    if applied:
+        _rebuild_saved()
+    return applied
+
+
+def _append_op(op: dict) -> None:
+    """Durably log one op; fold the log into a new snapshot every COMPACT_EVERY_OPS."""
+    with _STORE_LOCK:
+        with open(OPS_FILE, "a+b") as f:
+            # A crash can leave a torn last line; start a fresh one rather than extend it
+            if f.tell():
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    f.write(b"\n")
+            f.write(dumps(op) + b"\n")
+            f.flush()
+            os.fsync(f.fileno())
+        _STORE_CACHE["ops"] += 1
+        if _STORE_CACHE["ops"] >= COMPACT_EVERY_OPS:
+            save_store(_STORE_CACHE["data"])
+
+
+def load_store() -> dict:
+    """
+    Load the persistent article store. Creates empty store if missing.
+    Returns the cached store while the file on disk is unchanged.
+    """
+    with _STORE_LOCK:
+        if not STORE_FILE.exists():
+            log.info("[Store] No existing store — creating fresh.")
+            store = {"articles": [], "last_run": None, "run_count": 0}
+            _set_cache(store, None)
+            return store
+
+        mtime = STORE_FILE.stat().st_mtime_ns
+        if _STORE_CACHE["data"] is not None and _STORE_CACHE["mtime"] == mtime:
+            return _STORE_CACHE["data"]
+
+        try:
+            data = load_file(STORE_FILE)
+            log.info(f"[Store] Loaded {len(data.get('articles', []))} existing articles")
+        except (JSONDecodeError, KeyError) as e:
+            log.error(f"[Store] Store file corrupted: {e} — backing up and resetting")
+            shutil.copy(STORE_FILE, BACKUP_FILE)
+            data = {"articles": [], "last_run": None, "run_count": 0}
+        _set_cache(data, mtime)
+        # Replay in memory only — a read never rewrites the store. The owning
+        # process folds the log in via compact_store(), a merge, or _append_op.
+        applied = _replay_ops(data)
+        if applied:
+            _STORE_CACHE["ops"] = applied
+            log.info(f"[Store] Replayed {applied} op(s) from {OPS_FILE.name}")
         return data
-    except (json.JSONDecodeError, KeyError) as e:
-        log.error(f"[Store] Store file corrupted: {e} — backing up and resetting")
-        shutil.copy(STORE_FILE, BACKUP_FILE)
-        return {"articles": [], "last_run": None, "run_count": 0}
+
+
+def compact_store() -> None:
+    """Fold any pending ops into the snapshot. Call from the process that owns the store."""
+    with _STORE_LOCK:
+        store = load_store()
+        if _STORE_CACHE["ops"]:
+            save_store(store)
+
+
+def snapshot_store() -> dict:
+    """
+    Shallow copy of the store with its own article list, for readers outside
+    _STORE_LOCK (e.g. the sync worker) — save/unsave can't shift it underneath them.
+    """
+    with _STORE_LOCK:
+        store = load_store()
+        return {**store, "articles": list(store["articles"])}
 
 
 def save_store(store: dict) -> None:
-    """Write the store to disk."""
-    with open(STORE_FILE, "w", encoding="utf-8") as f:
-        json.dump(store, f, indent=2, ensure_ascii=False)
+    """
+    Write the store to disk atomically (temp file + fsync + os.replace).
+    The snapshot now holds every logged op, so the ops log is dropped.
+    """
+    with _STORE_LOCK:
+        dump_file(STORE_FILE, store, indent=PRETTY_STORE, fsync=True)
+        OPS_FILE.unlink(missing_ok=True)
+        _STORE_CACHE["ops"] = 0
+        if store is _STORE_CACHE["data"]:
+            # Callers keep the index in step with their edits — just note the new mtime
+            _STORE_CACHE["mtime"] = STORE_FILE.stat().st_mtime_ns
+        else:
+            _set_cache(store, STORE_FILE.stat().st_mtime_ns)
     log.info(f"[Store] Saved {len(store['articles'])} articles to {STORE_FILE}")
 
 
+# ─────────────────────────────────────────────────────────────────────────────
+# Seen URLs (read by the scraper to skip articles the store already has)
+# ─────────────────────────────────────────────────────────────────────────────
+def load_seen(source: str) -> dict:
+    """
+    URLs from this source merged into the store in recent runs → first-seen unix time.
+    Ignored while the article store is missing, so a wiped store is re-seeded in full.
+    """
+    path = TMP_DIR / f"seen_{source}.json"
+    if not STORE_FILE.exists():
+        return {}
+    try:
+        seen = loads(path.read_bytes())
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        log.warning(f"[Store] Ignoring unreadable seen-set {path}: {e}")
+        return {}
+    cutoff = time.time() - SEEN_RETENTION_HOURS * 3600
+    return {url: ts for url, ts in seen.items() if ts >= cutoff}
+
+
+def save_seen(source: str, seen: dict, new_urls: list) -> None:
+    """Add URLs to the source's seen-set and persist it (called once they are merged)."""
+    now = time.time()
+    for url in new_urls:
+        seen.setdefault(url, now)
+    try:
+        dump_file(TMP_DIR / f"seen_{source}.json", seen)
+    except Exception as e:
+        log.warning(f"[Store] Could not persist seen-set for {source}: {e}")
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # Load Raw Files
 # ─────────────────────────────────────────────────────────────────────────────
@@ -66,8 +263,7 @@ def load_raw(filename: str) -> list:
     if not path.exists():
         log.warning(f"[Store] Raw file not found: {path}")
         return []
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
+    return load_file(path)
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -78,49 +274,51 @@ def merge_and_store() -> dict:
     Load all raw files, merge them into the store, dedup by article ID.
     Returns a summary of what was added.
     """
-    store = load_store()
-    existing_ids = {a["id"] for a in store["articles"]}
-
-    # Load raw sources
-    raw_sources = {
-        "bensbites": load_raw("raw_bensbites.json"),
-        "therundown": load_raw("raw_therundown.json"),
-        "reddit": load_raw("raw_reddit.json"),
-    }
-
-    new_count = 0
-    for source_name, articles in raw_sources.items():
-        for article in articles:
-            art_id = article.get("id")
-            if not art_id or art_id in existing_ids:
+    # Load raw sources concurrently (independent read + parse each), before taking the lock
+    with ThreadPoolExecutor(max_workers=len(_RAW_SOURCES)) as ex:
+        raw_lists = list(ex.map(load_raw, [fname for _, fname in _RAW_SOURCES]))
+
+    with _STORE_LOCK:
+        store = load_store()
+        # The cached id index doubles as the dedup set — no per-run rebuild
+        index = _STORE_CACHE["index"]
+
+        new_count = 0
+        for articles in raw_lists:
+            for article in articles:
+                art_id = article.get("id")
+                if not art_id or art_id in index:
+                    continue
+
+                # Ensure saved fields exist (scrapers always emit both, so this rarely writes)
+                if "saved" not in article:
+                    article["saved"] = False
+                if "saved_at" not in article:
+                    article["saved_at"] = None
+                article["published_ts"] = int(_iso_ts(article.get("published_at")))
+
+                store["articles"].append(article)
+                index[art_id] = article
+                if article["saved"]:
+                    insort(_STORE_CACHE["saved"], _saved_key(article))
+                new_count += 1
+
+        store["last_run"] = datetime.now(UTC).isoformat()
+        store["run_count"] = store.get("run_count", 0) + 1
+
+        save_store(store)
+
+        # Only now are this run's raw articles safely in the store — mark them seen
+        for (source_name, _), articles in zip(_RAW_SOURCES, raw_lists):
+            if source_name not in _SEEN_SOURCES:
                 continue
+            urls = [a["url"] for a in articles if a.get("url")]
+            if urls:
+                save_seen(source_name, load_seen(source_name), urls)
 
-            # Ensure saved fields exist
-            article.setdefault("saved", False)
-            article.setdefault("saved_at", None)
-
-            store["articles"].append(article)
-            existing_ids.add(art_id)
-            new_count += 1
-
-    store["last_run"] = datetime.now(timezone.utc).isoformat()
-    store["run_count"] = store.get("run_count", 0) + 1
-
-    save_store(store)
-
-    # ── Supabase upsert after merge (background thread) ────────────────────
+    # ── Supabase upsert after merge (background worker) ────────────────────
     if supabase_enabled():
-        def _bg_sync():
-            try:
-                import sys as _sys
-                _tools = str(Path(__file__).parent)
-                if _tools not in _sys.path:
-                    _sys.path.insert(0, _tools)
-                from supabase_sync import get_client, sync_articles
-                sync_articles(get_client())
-            except Exception as e:
-                log.warning(f"[Store] Supabase background sync failed: {e}")
-        threading.Thread(target=_bg_sync, daemon=True).start()
+        _SYNC_Q.put((_sync_all, ()))
 
     summary = {
         "new_articles": new_count,
@@ -135,36 +333,68 @@ def merge_and_store() -> dict:
 # ─────────────────────────────────────────────────────────────────────────────
 # Save Article Action
 # ─────────────────────────────────────────────────────────────────────────────
+def _supabase_sync():
+    """Import tools/supabase_sync lazily — the store works without Supabase configured."""
+    import sys as _sys
+    _tools = str(Path(__file__).parent)
+    if _tools not in _sys.path:
+        _sys.path.insert(0, _tools)
+    import supabase_sync
+    return supabase_sync
+
+
+@lru_cache(maxsize=1)
 def supabase_enabled() -> bool:
-    """True if Supabase credentials are configured in .env."""
+    """True if Supabase credentials are configured in .env (read once per process)."""
     return bool(os.getenv("SUPABASE_URL") and os.getenv("SUPABASE_ANON_KEY"))
 
 
+def _sync_all() -> None:
+    sb = _supabase_sync()
+    sb.sync_articles(sb.get_client())
+
+
+# One long-lived worker runs queued Supabase jobs in order, so callers never
+# pay for thread start-up. Save/unsave go through supabase_sync's BatchEngine.
+_SYNC_Q = queue.Queue()
+
+
+def _drain_sync_q() -> None:
+    while True:
+        fn, args = _SYNC_Q.get()
+        try:
+            fn(*args)
+        except Exception as e:
+            log.warning(f"[Store] Supabase background sync failed: {e}")
+
+
+_SYNC_WORKER = threading.Thread(target=_drain_sync_q, name="store-sync", daemon=True)
+_SYNC_WORKER.start()
+
+
 def save_article(article_id: str) -> bool:
     """Mark an article as saved. Syncs to Supabase if configured."""
-    store = load_store()
-    for article in store["articles"]:
-        if article["id"] == article_id:
-            article["saved"] = True
-            article["saved_at"] = datetime.now(timezone.utc).isoformat()
-            save_store(store)
-            log.info(f"[Store] Article saved: {article_id[:16]}...")
-            # Sync to Supabase
-            if supabase_enabled():
-                def _sync():
-                    try:
-                        import sys as _sys
-                        _tools = str(Path(__file__).parent)
-                        if _tools not in _sys.path:
-                            _sys.path.insert(0, _tools)
-                        from supabase_sync import get_client, sync_saved_state
-                        sync_saved_state(get_client(), article_id, True)
-                    except Exception as e:
-                        log.warning(f"[Store] Supabase saved-state sync failed: {e}")
-                threading.Thread(target=_sync, daemon=True).start()
-            return True
-    log.warning(f"[Store] Article not found for save: {article_id}")
-    return False
+    with _STORE_LOCK:
+        store = load_store()
+        article = _STORE_CACHE["index"].get(article_id)
+        if article is None:
+            log.warning(f"[Store] Article not found for save: {article_id}")
+            return False
+        if article.get("saved"):
+            _drop_saved(article)
+        article["saved"] = True
+        article["saved_at"] = datetime.now(UTC).isoformat()
+        insort(_STORE_CACHE["saved"], _saved_key(article))
+        _append_op({"op": "upsert", "id": article_id,
+                    "fields": {"saved": True, "saved_at": article["saved_at"]}})
+    log.info(f"[Store] Article saved: {article_id[:16]}...")
+    # Sync to Supabase (queued; the batch engine coalesces bursts of clicks)
+    if supabase_enabled():
+        try:
+            _supabase_sync().get_batch_engine().submit_save(article)
+        except Exception as e:
+            log.warning(f"[Store] Supabase saved-state sync failed: {e}")
+    return True
 
 
 def unsave_article(article_id: str) -> bool:
@@ -172,33 +402,28 @@ def unsave_article(article_id: str) -> bool:
     Hard-delete an article from the local store and Supabase.
     Called when the user un-saves — the article is permanently removed.
     """
-    store = load_store()
-    before_count = len(store["articles"])
-
-    # Remove from local store entirely
-    store["articles"] = [a for a in store["articles"] if a["id"] != article_id]
-
-    if len(store["articles"]) == before_count:
-        # Article wasn't found
-        log.warning(f"[Store] Article not found for delete: {article_id}")
-        return False
-
-    save_store(store)
+    with _STORE_LOCK:
+        store = load_store()
+        article = _STORE_CACHE["index"].pop(article_id, None)
+        if article is None:
+            # Article wasn't found
+            log.warning(f"[Store] Article not found for delete: {article_id}")
+            return False
+
+        # Remove from local store entirely — an O(N) list scan (dict __eq__ on each
+        # earlier element), but in-memory only; the disk write is one appended op
+        store["articles"].remove(article)
+        if article.get("saved"):
+            _drop_saved(article)
+        _append_op({"op": "delete", "id": article_id})
     log.info(f"[Store] 🗑️  Article hard-deleted locally: {article_id[:16]}...")
 
-    # Hard-delete from Supabase in background thread
+    # Hard-delete from Supabase (queued; the batch engine coalesces bursts of clicks)
     if supabase_enabled():
-        def _delete():
-            try:
-                import sys as _sys
-                _tools = str(Path(__file__).parent)
-                if _tools not in _sys.path:
-                    _sys.path.insert(0, _tools)
-                from supabase_sync import get_client, delete_article as sb_delete
-                sb_delete(get_client(), article_id)
-            except Exception as e:
-                log.warning(f"[Store] Supabase delete failed: {e}")
-        threading.Thread(target=_delete, daemon=True).start()
+        try:
+            _supabase_sync().get_batch_engine().submit_delete(article_id)
+        except Exception as e:
+            log.warning(f"[Store] Supabase delete failed: {e}")
 
     return True
 
@@ -207,25 +432,21 @@ def unsave_article(article_id: str) -> bool:
 # Query Helpers
 # ─────────────────────────────────────────────────────────────────────────────
 def get_today_feed(store: dict) -> list:
-    """Return articles from the last LOOKBACK_HOURS."""
-    cutoff = datetime.now(timezone.utc) - timedelta(hours=LOOKBACK_HOURS)
-    result = []
-    for a in store["articles"]:
-        try:
-            pub = datetime.fromisoformat(a["published_at"])
-            if pub.tzinfo is None:
-                pub = pub.replace(tzinfo=timezone.utc)
-            if pub >= cutoff:
-                result.append(a)
-        except Exception:
-            continue
-    return sorted(result, key=lambda x: x.get("published_at", ""), reverse=True)
+    """Return articles from the last LOOKBACK_HOURS, newest first."""
+    cutoff_ts = int((datetime.now(UTC) - timedelta(hours=LOOKBACK_HOURS)).timestamp())
+    result = [a for a in store["articles"] if a.get("published_ts", 0) >= cutoff_ts]
+    result.sort(key=itemgetter("published_ts"), reverse=True)
+    return result
 
 
 def get_saved_articles(store: dict) -> list:
     """Return all saved articles, newest saved first."""
+    with _STORE_LOCK:
+        if store is _STORE_CACHE["data"]:
+            index = _STORE_CACHE["index"]
+            return [index[art_id] for _, art_id in _STORE_CACHE["saved"]]
     saved = [a for a in store["articles"] if a.get("saved")]
-    return sorted(saved, key=lambda x: x.get("saved_at", ""), reverse=True)
+    return sorted(saved, key=lambda x: x.get("saved_at") or "", reverse=True)
 
 
 def get_stats(store: dict) -> dict:
@@ -250,4 +471,4 @@ def get_stats(store: dict) -> dict:
 if __name__ == "__main__":
     logging.basicConfig(level=logging.INFO)
     summary = merge_and_store()
-    print(json.dumps(summary, indent=2))
+    print(dumps(summary, indent=True).decode("utf-8"))
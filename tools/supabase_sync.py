@@ -5,19 +5,37 @@ SOP Reference: architecture/SOP-003-supabase.md
 Schema Reference: gemini.md Section 2.1
 
 Usage:
-  python tools/supabase_sync.py              # Sync store → Supabase
+  python tools/supabase_sync.py              # Sync changed articles → Supabase
+  python tools/supabase_sync.py --full       # Re-upsert every article
   python tools/supabase_sync.py --test       # Just test connection
   python tools/supabase_sync.py --log-run    # Log a scrape run record
 """
 
 import os
 import sys
-import json
+import hashlib
+import time
+import queue
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
 from dotenv import load_dotenv
 
+try:
+    from supabase import create_client
+except ImportError:
+    create_client = None   # get_client() raises with install instructions
+
+# Allow `from tools.supabase_sync import *` from the repo root (see README)
+_TOOLS_DIR = str(Path(__file__).parent)
+if _TOOLS_DIR not in sys.path:
+    sys.path.insert(0, _TOOLS_DIR)
+from _jsonio import dumps, load_file, dump_file, JSONDecodeError
+from store import snapshot_store, save_store
+
 # ─────────────────────────────────────────────────────────────────────────────
 # Setup
 # ─────────────────────────────────────────────────────────────────────────────
@@ -40,21 +58,39 @@ log = logging.getLogger("supabase_sync")
 
 SUPABASE_URL      = os.getenv("SUPABASE_URL", "")
 SUPABASE_ANON_KEY = os.getenv("SUPABASE_ANON_KEY", "")
+UTC               = timezone.utc
+
+SYNC_BATCH_SIZE = 500   # rows per upsert — well under Supabase's ~1 MB body limit
+SYNC_WORKERS    = 8     # upsert batches in flight at once
+
+# {article id: content hash} of rows as last upserted, so unchanged rows are skipped
+HASH_FILE = BASE_DIR / "data" / ".sync_hashes.json"
+
+try:
+    import xxhash
 
+    def _row_hash(payload: bytes) -> str:
+        return xxhash.xxh3_64_hexdigest(payload)
+except ImportError:
+    def _row_hash(payload: bytes) -> str:
+        return hashlib.blake2b(payload, digest_size=8).hexdigest()
 
+
+@lru_cache(maxsize=1)
 def get_client():
-    """Return a Supabase client, or raise clearly if not configured."""
+    """
+    Return the shared Supabase client, or raise clearly if not configured.
+    Built once per process so every caller reuses its HTTP connection pool.
+    """
     if not SUPABASE_URL or not SUPABASE_ANON_KEY:
         raise RuntimeError(
             "SUPABASE_URL and SUPABASE_ANON_KEY must be set in .env"
         )
-    try:
-        from supabase import create_client, Client
-        return create_client(SUPABASE_URL, SUPABASE_ANON_KEY)
-    except ImportError:
+    if create_client is None:
         raise RuntimeError(
             "supabase-py not installed. Run: pip install supabase"
         )
+    return create_client(SUPABASE_URL, SUPABASE_ANON_KEY)
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -77,20 +113,26 @@ def test_connection() -> bool:
 # Load Local Store
 # ─────────────────────────────────────────────────────────────────────────────
 def load_local_store() -> dict:
+    """
+    Load via store.py so save/unsave ops still in the ops log are included.
+    Returns a snapshot: its article list is safe to iterate while the server writes.
+    """
     if not DATA_FILE.exists():
         log.warning(f"[Supabase] Local store not found: {DATA_FILE}")
         return {"articles": [], "last_run": None, "version": 1}
-    with open(DATA_FILE, "r", encoding="utf-8") as f:
-        return json.load(f)
+    return snapshot_store()
 
 
 # ─────────────────────────────────────────────────────────────────────────────
 # Article serialiser → Supabase row shape
 # ─────────────────────────────────────────────────────────────────────────────
-def to_db_row(article: dict) -> dict:
+def to_db_row(article: dict, now_iso: str = None) -> dict:
     """
     Convert a local article dict to the Supabase articles table schema.
     Handles None values and type coercions safely.
+    now_iso is the scraped_at fallback; pass one value when converting many rows.
+    Always builds a new dict: local articles carry keys with no cloud column
+    (published_ts), and empty strings must become NULL for timestamp columns.
     """
     pub = article.get("published_at")
     saved_at = article.get("saved_at")
@@ -103,7 +145,7 @@ def to_db_row(article: dict) -> dict:
         "summary":      article.get("summary") or None,
         "url":          article.get("url", ""),
         "published_at": pub      or None,
-        "scraped_at":   scraped  or datetime.now(timezone.utc).isoformat(),
+        "scraped_at":   scraped  or now_iso or datetime.now(UTC).isoformat(),
         "author":       article.get("author") or None,
         "tags":         article.get("tags")   or [],
         "image_url":    article.get("image_url") or None,
@@ -115,10 +157,22 @@ def to_db_row(article: dict) -> dict:
 # ─────────────────────────────────────────────────────────────────────────────
 # Upsert All Articles
 # ─────────────────────────────────────────────────────────────────────────────
-def sync_articles(client) -> dict:
+def _load_sync_hashes() -> dict:
+    if not HASH_FILE.exists():
+        return {}
+    try:
+        return load_file(HASH_FILE)
+    except JSONDecodeError:
+        log.warning(f"[Supabase] {HASH_FILE.name} unreadable — doing a full sync")
+        return {}
+
+
+def sync_articles(client, full: bool = False) -> dict:
     """
-    Upsert every article from local store into Supabase.
+    Upsert local articles into Supabase.
     Uses id as conflict key → idempotent (safe to run multiple times).
+    Rows whose content hash matches the last successful sync are skipped;
+    full=True ignores the recorded hashes and upserts everything.
     """
     store = load_local_store()
     articles = store.get("articles", [])
@@ -129,24 +183,52 @@ def sync_articles(client) -> dict:
 
     log.info(f"[Supabase] Syncing {len(articles)} articles → Supabase...")
 
-    rows    = [to_db_row(a) for a in articles]
-    batch   = 50          # Supabase HTTP body limit safety
-    total   = 0
-    errors  = 0
+    now_iso    = datetime.now(UTC).isoformat()
+    rows       = [to_db_row(a, now_iso) for a in articles]
+    # A missing scraped_at gets now_iso, which must not make the row look changed
+    new_hashes = {
+        row["id"]: _row_hash(dumps(row if a.get("scraped_at") else {**row, "scraped_at": None}))
+        for a, row in zip(articles, rows)
+    }
+    old_hashes = {} if full else _load_sync_hashes()
+    # Unchanged rows stay recorded; ids no longer in the store drop out
+    synced     = {i: h for i, h in new_hashes.items() if old_hashes.get(i) == h}
+    dirty      = [row for row in rows if row["id"] not in synced]
+
+    if not dirty:
+        log.info("[Supabase] No changes since last sync — nothing to upsert.")
+        dump_file(HASH_FILE, synced)
+        return {"upserted": 0, "errors": 0}
+    log.info(f"[Supabase] {len(dirty)} changed, {len(synced)} unchanged")
 
-    for i in range(0, len(rows), batch):
-        chunk = rows[i:i + batch]
+    batch   = SYNC_BATCH_SIZE
+    chunks  = [dirty[i:i + batch] for i in range(0, len(dirty), batch)]
+
+    def _upsert(n: int, chunk: list) -> bool:
         try:
-            resp = (
+            (
                 client.table("articles")
                 .upsert(chunk, on_conflict="id")
                 .execute()
             )
-            total += len(chunk)
-            log.info(f"[Supabase] ✅ Batch {i//batch + 1}: {len(chunk)} rows upserted")
+            log.info(f"[Supabase] ✅ Batch {n}: {len(chunk)} rows upserted")
+            return True
         except Exception as e:
-            errors += len(chunk)
-            log.error(f"[Supabase] ❌ Batch {i//batch + 1} failed: {e}")
+            log.error(f"[Supabase] ❌ Batch {n} failed: {e}")
+            return False
+
+    # Batches are independent upserts — keep several HTTP requests in flight
+    with ThreadPoolExecutor(max_workers=SYNC_WORKERS) as ex:
+        results = list(ex.map(_upsert, range(1, len(chunks) + 1), chunks))
+    total   = 0
+    errors  = 0
+    for chunk, ok in zip(chunks, results):
+        if ok:
+            total += len(chunk)
+            synced.update((row["id"], new_hashes[row["id"]]) for row in chunk)
+        else:
+            errors += len(chunk)   # left out of HASH_FILE → retried next sync
+    dump_file(HASH_FILE, synced)
 
     log.info(f"[Supabase] Sync complete — {total} upserted, {errors} errors")
     return {"upserted": total, "errors": errors}
@@ -160,7 +242,7 @@ def sync_saved_state(client, article_id: str, saved: bool) -> bool:
     try:
         payload = {
             "saved": saved,
-            "saved_at": datetime.now(timezone.utc).isoformat() if saved else None
+            "saved_at": datetime.now(UTC).isoformat() if saved else None
         }
         client.table("articles").update(payload).eq("id", article_id).execute()
         log.info(f"[Supabase] save={saved} synced for article {article_id[:12]}...")
@@ -178,15 +260,109 @@ def delete_article(client, article_id: str) -> bool:
     Hard-delete an article from the Supabase articles table by id.
     Called when user un-saves — article is permanently removed from cloud.
     """
+    return delete_articles(client, [article_id])
+
+
+def delete_articles(client, ids: list) -> bool:
+    """Hard-delete many articles from Supabase in one round trip."""
+    if not ids:
+        return True
     try:
-        client.table("articles").delete().eq("id", article_id).execute()
-        log.info(f"[Supabase] 🗑️  Deleted article {article_id[:12]}... from cloud")
+        client.table("articles").delete().in_("id", ids).execute()
+        log.info(f"[Supabase] 🗑️  Deleted {len(ids)} article(s) from cloud")
         return True
     except Exception as e:
-        log.error(f"[Supabase] Failed to delete article {article_id[:12]}...: {e}")
+        log.error(f"[Supabase] Failed to delete {len(ids)} article(s): {e}")
         return False
 
 
+# ─────────────────────────────────────────────────────────────────────────────
+# Batched Save/Unsave Writes
+# ─────────────────────────────────────────────────────────────────────────────
+class BatchEngine:
+    """
+    Coalesces save/unsave clicks into batched Supabase writes.
+    A single daemon thread drains the queue every FLUSH_INTERVAL seconds and
+    issues at most one upsert (saves) and one delete (unsaves) per batch.
+    The newest op per article id wins within a batch.
+    """
+
+    FLUSH_INTERVAL = 0.05   # seconds to wait for more ops after the first
+    MAX_BATCH      = 500
+
+    def __init__(self, client_factory=None):
+        self._client_factory = client_factory or get_client
+        self._queue  = queue.Queue()
+        self._lock   = threading.Lock()
+        self._thread = None
+
+    def submit_save(self, article: dict) -> None:
+        """Queue an upsert of the article's full row (saved state included)."""
+        self._put(("save", article["id"], to_db_row(article)))
+
+    def submit_delete(self, article_id: str) -> None:
+        """Queue a hard delete of the article from the cloud."""
+        self._put(("delete", article_id, None))
+
+    def _put(self, op: tuple) -> None:
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="supabase-batch", daemon=True
+                )
+                self._thread.start()
+        self._queue.put(op)
+
+    def _run(self) -> None:
+        while True:
+            ops = [self._queue.get()]
+            deadline = time.monotonic() + self.FLUSH_INTERVAL
+            while len(ops) < self.MAX_BATCH:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    ops.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            try:
+                self._flush(ops)
+            except Exception as e:
+                log.error(f"[Supabase] Batch of {len(ops)} save/unsave ops failed: {e}")
+
+    def _flush(self, ops: list) -> None:
+        latest = {}
+        for kind, article_id, row in ops:
+            latest[article_id] = (kind, row)
+
+        rows = [row for kind, row in latest.values() if kind == "save"]
+        ids  = [article_id for article_id, (kind, _) in latest.items() if kind == "delete"]
+
+        client = self._client_factory()
+        # Saves and deletes fail independently — one error must not drop the other
+        if rows:
+            try:
+                client.table("articles").upsert(rows, on_conflict="id").execute()
+                log.info(f"[Supabase] save=True synced for {len(rows)} article(s)")
+            except Exception as e:
+                log.error(f"[Supabase] Failed to sync saved state for {len(rows)} article(s): {e}")
+        if ids:
+            delete_articles(client, ids)
+
+
+_ENGINE = None
+_ENGINE_LOCK = threading.Lock()
+
+
+def get_batch_engine() -> BatchEngine:
+    """Return the process-wide BatchEngine, creating it on first use."""
+    global _ENGINE
+    with _ENGINE_LOCK:
+        if _ENGINE is None:
+            _ENGINE = BatchEngine()
+        return _ENGINE
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # Log a Scrape Run
 # ─────────────────────────────────────────────────────────────────────────────
@@ -195,7 +371,7 @@ def log_scrape_run(client, scrape_summary: dict) -> bool:
     try:
         sources = scrape_summary.get("sources", {})
         row = {
-            "run_at":           scrape_summary.get("run_at") or datetime.now(timezone.utc).isoformat(),
+            "run_at":           scrape_summary.get("run_at") or datetime.now(UTC).isoformat(),
             "elapsed_seconds":  scrape_summary.get("elapsed_seconds", 0),
             "bensbites_count":  sources.get("bensbites", 0),
             "therundown_count": sources.get("therundown", 0),
@@ -226,24 +402,23 @@ def pull_from_supabase(client) -> int:
         log.info(f"[Supabase] Pulled {len(rows)} articles from cloud")
 
         # Load and merge into local store
+        # A snapshot, not the cached store — save_store re-indexes it on write
         store = load_local_store()
-        existing_ids = {a["id"] for a in store.get("articles", [])}
+        idx = {a["id"]: a for a in store["articles"]}
 
         new_count = 0
         for row in rows:
-            if row["id"] not in existing_ids:
-                store.setdefault("articles", []).append(row)
+            existing = idx.get(row["id"])
+            if existing is None:
+                store["articles"].append(row)
+                idx[row["id"]] = row
                 new_count += 1
             else:
                 # Update existing (cloud is authoritative for saved state)
-                for a in store["articles"]:
-                    if a["id"] == row["id"]:
-                        a["saved"]    = row.get("saved", False)
-                        a["saved_at"] = row.get("saved_at")
-                        break
-
-        with open(DATA_FILE, "w", encoding="utf-8") as f:
-            json.dump(store, f, indent=2, ensure_ascii=False)
+                existing["saved"]    = row.get("saved", False)
+                existing["saved_at"] = row.get("saved_at")
+
+        save_store(store)
         log.info(f"[Supabase] ✅ Merge complete — {new_count} new articles added locally")
         return new_count
     except Exception as e:
@@ -276,8 +451,8 @@ def run():
         log.error("Aborting sync — connection failed")
         sys.exit(1)
 
-    # Full sync
-    result = sync_articles(client)
+    # Sync changed rows (--full re-sends everything, e.g. after a cloud reset)
+    result = sync_articles(client, full="--full" in args)
 
     log.info(f"✅ Sync done — upserted: {result['upserted']}, errors: {result['errors']}")
 